@@ -3,6 +3,7 @@ import json
 import pandas as pd
 import re
 import io
+from output_writer import write_sections
 
 def extract_text_from_sheet(sheet_df):
     text_list = []
@@ -404,7 +405,26 @@ def split_json_file(input_data):
     result.update(process_remote_controls(split_data))
     return result
 
+def parse_output_args(args):
+    # python convert2.py [output_folder] [shard_size]
+    output_folder = args[0] if len(args) > 0 else None
+    shard_size = None
+    if len(args) > 1:
+        try:
+            shard_size = int(args[1])
+        except ValueError:
+            raise ValueError(f"shard_size 必须为正整数：'{args[1]}'")
+        if shard_size <= 0:
+            raise ValueError(f"shard_size 必须为正整数：'{args[1]}'")
+    return output_folder, shard_size
+
 def main():
+    try:
+        output_folder, shard_size = parse_output_args(sys.argv[1:])
+    except ValueError as e:
+        print(json.dumps({"error": f"Invalid arguments: {e}"}), file=sys.stderr)
+        sys.exit(2)
+
     try:
         file_content = sys.stdin.buffer.read()
         all_text_data = process_excel_to_json(io.BytesIO(file_content))
@@ -414,10 +434,20 @@ def main():
             print(json_output)
         else:
             print(json.dumps({"error": "No matching worksheets found"}))
+            return
     except Exception as e:
         error_message = f"Error: {e}"
         print(json.dumps({"error": error_message}), file=sys.stderr)
         sys.exit(1)
 
+    # 分文件写出失败不影响 stdout 中已经输出的 result
+    if output_folder:
+        sys.stdout.flush()
+        try:
+            sections = dict(result, device_name_to_type=device_name_to_type)
+            write_sections(sections, output_folder, shard_size=shard_size)
+        except Exception as e:
+            print(json.dumps({"error": f"Section output error: {e}"}), file=sys.stderr)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,147 @@
+import os
+import json
+import hashlib
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+INDEX_FILE_NAME = "index.json"
+
+def current_file_mode():
+    # mkstemp 创建的文件权限是 0600，这里按 umask 换算成 open() 默认的权限
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+def serialize_section(name, data):
+    # device_name_to_type 这类映射直接输出，列表按 {name: [...]} 包装，和 testing2 中的文件格式一致
+    payload = {name: data} if isinstance(data, list) else data
+    return json.dumps(payload, indent=4, ensure_ascii=False).encode("utf-8")
+
+def write_atomic(path, content, file_mode):
+    # 先写同目录下的临时文件，再 rename 覆盖，读取方不会看到写了一半的文件
+    folder = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(temp_path, file_mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_file(output_folder, file_name, name, data, file_mode):
+    content = serialize_section(name, data)
+    write_atomic(os.path.join(output_folder, file_name), content, file_mode)
+    return {
+        "path": file_name,
+        "count": len(data),
+        "sha256": hashlib.sha256(content).hexdigest()
+    }
+
+def plan_section_files(name, data, shard_size):
+    if not shard_size or not isinstance(data, list) or len(data) <= shard_size:
+        return [(f"{name}.json", data)]
+
+    shards = []
+    for shard_index, start in enumerate(range(0, len(data), shard_size)):
+        shards.append((f"{name}.{shard_index:04d}.json", data[start:start + shard_size]))
+    return shards
+
+def read_index_paths(output_folder):
+    index_path = os.path.join(output_folder, INDEX_FILE_NAME)
+    try:
+        with open(index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return set()
+
+    paths = set()
+    for section_index in index.get("sections", {}).values():
+        for entry in section_index.get("files", []):
+            paths.add(entry["path"])
+    return paths
+
+def write_sections(sections, output_folder, shard_size=None, max_workers=None):
+    """
+    sections: {"devices": [...], "groups": [...], ..., "device_name_to_type": {...}}
+    shard_size: 列表长度超过 shard_size 的 section 会被拆成 <name>.0000.json, <name>.0001.json ...
+    所有文件并行写入，每个文件单独原子替换；全部写完后再写 index.json（包含每个文件的数量和 sha256）。
+    index.json 是整次写出的提交点：只有写完它，新的一组文件才算生效，之后再删除上一次 index.json
+    中列出、这次不再生成的文件。写入过程中读取方可能看到新文件和旧 index，load_section 会通过
+    sha256 检测出来并报错，调用方重试即可。
+    """
+    if shard_size is not None and shard_size <= 0:
+        raise ValueError("shard_size 必须为正整数。")
+
+    os.makedirs(output_folder, exist_ok=True)
+    file_mode = current_file_mode()
+    previous_paths = read_index_paths(output_folder)
+
+    jobs = []
+    for name, data in sections.items():
+        for file_name, chunk in plan_section_files(name, data, shard_size):
+            jobs.append((name, file_name, chunk))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(write_file, output_folder, file_name, name, chunk, file_mode)
+            for name, file_name, chunk in jobs
+        ]
+        file_entries = [future.result() for future in futures]
+
+    index = {"sections": {}}
+    for (name, _, _), entry in zip(jobs, file_entries):
+        section_index = index["sections"].setdefault(name, {"count": 0, "files": []})
+        section_index["count"] += entry["count"]
+        section_index["files"].append(entry)
+
+    index_content = json.dumps(index, indent=4, ensure_ascii=False).encode("utf-8")
+    write_atomic(os.path.join(output_folder, INDEX_FILE_NAME), index_content, file_mode)
+
+    current_paths = {entry["path"] for entry in file_entries}
+    for stale_path in previous_paths - current_paths:
+        try:
+            os.remove(os.path.join(output_folder, stale_path))
+        except FileNotFoundError:
+            pass
+    return index
+
+def load_section(output_folder, name):
+    """
+    通过 index.json 读取单个 section，分片会按顺序拼接。
+    每个文件都会校验 sha256 和数量，与 index 不一致（例如正好读到另一个进程写了一半）时抛出 ValueError。
+    """
+    with open(os.path.join(output_folder, INDEX_FILE_NAME), "r", encoding="utf-8") as file:
+        index = json.load(file)
+
+    section_index = index["sections"].get(name)
+    if section_index is None:
+        raise KeyError(f"index.json 中不存在 section：'{name}'")
+
+    files = section_index["files"]
+    items = []
+    mapping = None
+    for entry in files:
+        with open(os.path.join(output_folder, entry["path"]), "rb") as file:
+            content = file.read()
+        if hashlib.sha256(content).hexdigest() != entry["sha256"]:
+            raise ValueError(f"文件校验失败，与 index.json 不一致：'{entry['path']}'")
+
+        payload = json.loads(content.decode("utf-8"))
+        if isinstance(payload, dict) and isinstance(payload.get(name), list):
+            chunk = payload[name]
+            items.extend(chunk)
+        else:
+            if len(files) != 1:
+                raise ValueError(f"映射类型的 section 只能有一个文件：'{name}'")
+            chunk = payload
+            mapping = payload
+
+        if len(chunk) != entry["count"]:
+            raise ValueError(f"文件数量与 index.json 不一致：'{entry['path']}'")
+
+    return mapping if mapping is not None else items